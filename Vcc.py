@@ -2,19 +2,29 @@
 # Vcc measurement module for Raspberry Pi Pico
 #
 # Reads ADC2 and scales it to actual Vcc using a fixed multiplier.
+# Samples are 4x oversampled and IIR filtered across calls.
 
 from machine import ADC
 
 class Vcc:
-    def __init__(self, adc_channel=2, vref=3.3, scale=10.0):
+    def __init__(self, adc_channel=2, vref=3.3, scale=10.0, alpha=0.2):
         """
         adc_channel: ADC channel number (2 = ADC2 / GP28)
         vref: ADC reference voltage (typically 3.3V on Pico)
         scale: multiplier to convert ADC pin voltage to Vcc
+        alpha: IIR coefficient (0<alpha<=1), higher = faster response, noisier
         """
         self.adc = ADC(adc_channel)
         self._K = vref * scale / 65535.0
+        self._alpha = alpha
+        self._acc = 0.0
+
+    def read_adc_raw(self):
+        """Returns 4x oversampled (box averaged) raw ADC reading."""
+        read = self.adc.read_u16
+        return (read() + read() + read() + read()) >> 2
 
     def read_vcc_voltage(self):
-        """Returns scaled Vcc voltage."""
-        return self.adc.read_u16() * self._K
+        """Returns filtered, scaled Vcc voltage."""
+        self._acc = self._acc + self._alpha * (self.read_adc_raw() * self._K - self._acc)
+        return self._acc
@@ -1,96 +1,229 @@
 # a2d.py
 # Minimal ADS1115 driver and constants for MicroPython used by the HF amplifier controller
-# Provides: ADS1115 class with probe(), read_voltage(channel, pga=None, data_rate=None)
-# and constants for PGA and Data Rate matching usage in the repo.
+# Provides: ADS1115 class with probe(), read_voltage(channel),
+# read_voltage_cfg(channel, pga, data_rate), start_read()/ready()/last(),
+# start_continuous()/read_last() and constants for PGA and Data Rate matching usage in the repo.
 
 import utime
+import machine
+import micropython
+from machine import Pin
+from micropython import const
 
 # ADS1115 registers
-_CONVERSION_REG = 0x00
-_CONFIG_REG = 0x01
+_CONVERSION_REG = const(0x00)
+_CONFIG_REG = const(0x01)
+_LO_THRESH_REG = const(0x02)
+_HI_THRESH_REG = const(0x03)
+
+# Comparator queue bits (config register bits 1:0)
+_COMP_QUE_1 = const(0x0000)    # assert ALERT/RDY after one conversion (conversion-ready mode)
+_COMP_DISABLE = const(0x0003)  # comparator off, ALERT/RDY high-Z
+
+# OS bit: write 1 to start a single-shot conversion, reads 1 when idle
+_OS_BIT = const(0x8000)
 
 # PGA (full-scale) configuration bits (config register bits 11:9)
-PGA_6_144V = 0x0000
-PGA_4_096V = 0x0200
-PGA_2_048V = 0x0400
-PGA_1_024V = 0x0600
-PGA_0_512V = 0x0800
-PGA_0_256V = 0x0A00
+PGA_6_144V = const(0x0000)
+PGA_4_096V = const(0x0200)
+PGA_2_048V = const(0x0400)
+PGA_1_024V = const(0x0600)
+PGA_0_512V = const(0x0800)
+PGA_0_256V = const(0x0A00)
 
 # Data rate configuration bits (config register bits 7:5)
-DR_8SPS   = 0x0000
-DR_16SPS  = 0x0020
-DR_32SPS  = 0x0040
-DR_64SPS  = 0x0060
-DR_128SPS = 0x0080
-DR_250SPS = 0x00A0
-DR_475SPS = 0x00C0
-DR_860SPS = 0x00E0
-
-# Convenience mapping from DR code -> samples/sec (used internally to wait for conversion)
-_DR_SPS = {
-    DR_8SPS: 8,
-    DR_16SPS: 16,
-    DR_32SPS: 32,
-    DR_64SPS: 64,
-    DR_128SPS: 128,
-    DR_250SPS: 250,
-    DR_475SPS: 475,
-    DR_860SPS: 860,
-}
-
-# Map PGA bits to full-scale voltage
-_PGA_FS_V = {
-    PGA_6_144V: 6.144,
-    PGA_4_096V: 4.096,
-    PGA_2_048V: 2.048,
-    PGA_1_024V: 1.024,
-    PGA_0_512V: 0.512,
-    PGA_0_256V: 0.256,
-}
+DR_8SPS   = const(0x0000)
+DR_16SPS  = const(0x0020)
+DR_32SPS  = const(0x0040)
+DR_64SPS  = const(0x0060)
+DR_128SPS = const(0x0080)
+DR_250SPS = const(0x00A0)
+DR_475SPS = const(0x00C0)
+DR_860SPS = const(0x00E0)
+
+# DR code -> samples/sec, indexed by (data_rate >> 5) & 0x7
+_DR_SPS = (8, 16, 32, 64, 128, 250, 475, 860)
+
+# PGA code -> full-scale volts, indexed by (pga >> 9) & 0x7 (codes 6 and 7 are also 0.256 V)
+_PGA_FS_V = (6.144, 4.096, 2.048, 1.024, 0.512, 0.256, 0.256, 0.256)
+
+
+def _sps(data_rate):
+    return _DR_SPS[(data_rate >> 5) & 0x7]
+
+
+def _fs_v(pga):
+    return _PGA_FS_V[(pga >> 9) & 0x7]
+
+
+@micropython.viper
+def _compose_cfg(channel: int, pga: int, data_rate: int, comp: int) -> int:
+    # OS = 1 (start single conversion) | MUX single-ended AINx | PGA |
+    # Mode = single-shot | data rate | comparator queue bits
+    return 0x8000 | 0x4000 | (channel << 12) | pga | 0x0100 | data_rate | comp
+
+
+@micropython.viper
+def _decode(buf: ptr8) -> int:
+    # Big-endian two's complement int16 from the 2-byte conversion register,
+    # sign-extended without a branch: (u ^ 0x8000) - 0x8000
+    return (((buf[0] << 8) | buf[1]) ^ 0x8000) - 0x8000
+
+
+def _timeout_ms(data_rate):
+    # Safety timeout for one conversion: two conversion periods
+    return int(2000 / _sps(data_rate)) + 1
+
+
+def _period_ms(data_rate):
+    # One conversion at the slowest rate the datasheet allows (-10%)
+    return int(1100 / _sps(data_rate)) + 1
+
 
 class ADS1115:
     """
     Minimal ADS1115 wrapper compatible with usage elsewhere in this repository.
 
     Usage:
-      ads = ADS1115(i2c, address=0x48)
+      ads = ADS1115(i2c, address=0x48, alert_pin=None, pga=PGA_4_096V, data_rate=DR_250SPS)
       ads.probe()  # returns True if device responds on I2C
-      v = ads.read_voltage(channel=0, pga=PGA_4_096V, data_rate=DR_250SPS)
+      v = ads.read_voltage(0)                               # fast path, constructor PGA / rate
+      v = ads.read_voltage_cfg(0, PGA_2_048V, DR_860SPS)    # explicit PGA / rate
 
     Notes:
     - This implementation performs single-shot conversions for single-ended channels 0..3.
-    - It attempts to be conservative about timing by waiting one conversion period + small margin.
-    - It uses the standard ADS1115 config register layout and disables the comparator by setting COMP_QUE = 0b11.
+      start_continuous()/read_last() switch one channel to continuous mode instead.
+    - start_read()/ready()/last() run a single-shot conversion without blocking:
+      a one-shot machine.Timer fetches the result after one conversion period.
+    - With alert_pin (GPIO wired to ALERT/RDY), the thresholds are programmed for
+      conversion-ready mode and read_raw() idles until the falling-edge IRQ fires.
+    - Without alert_pin, the comparator is disabled (COMP_QUE = 0b11) and read_raw()
+      polls the OS bit of the config register until the conversion completes.
+    - Either wait is bounded by two conversion periods as a safety timeout.
     """
 
-    def __init__(self, i2c, address=0x48):
+    def __init__(self, i2c, address=0x48, alert_pin=None,
+                 pga=PGA_4_096V, data_rate=DR_250SPS):
         self.i2c = i2c
         self.address = address
+        self.pga = pga
+        self.data_rate = data_rate
+
+        # Preallocated I2C buffers (no per-sample allocations)
+        self._cfg_buf = bytearray(3)          # [pointer=config, hi, lo]
+        self._cfg_buf[0] = _CONFIG_REG
+        self._rx_buf = bytearray(2)
+
+        # True while the device address pointer is known to sit on the conversion register
+        self._ptr_is_conv = False
+
+        # Conversion-ready flag, set from the ALERT/RDY pin IRQ
+        self._ready = False
+        self._alert = None
+        if alert_pin is not None:
+            # Hi_Thresh MSB = 1, Lo_Thresh MSB = 0 => ALERT/RDY becomes conversion-ready output
+            self.i2c.writeto_mem(self.address, _HI_THRESH_REG, b"\x80\x00")
+            self.i2c.writeto_mem(self.address, _LO_THRESH_REG, b"\x00\x00")
+            self._alert = Pin(alert_pin, Pin.IN, Pin.PULL_UP)
+            self._alert.irq(trigger=Pin.IRQ_FALLING, handler=self._on_alert)
+
+        # Conversion-ready on ALERT/RDY if wired, otherwise comparator disabled
+        self._comp = _COMP_QUE_1 if self._alert is not None else _COMP_DISABLE
+
+        # Precomputed scalars for the read_voltage() fast path
+        self._default_cfg = _compose_cfg(0, pga, data_rate, self._comp)
+        self._default_timeout_ms = _timeout_ms(data_rate)
+        self._default_lsb_v = _fs_v(pga) / 32768.0
+        self._cont_lsb_v = self._default_lsb_v
+        self._default_period_ms = _period_ms(data_rate)
+
+        # Non-blocking read state (start_read / ready / last)
+        self._timer = machine.Timer()
+        self._on_timer_cb = self._on_timer  # bound once, not per start_read()
+        self._busy = False
+        self._async_ready = False
+        self._async_raw = 0
+        self._async_lsb_v = self._default_lsb_v
+        self._async_err = None
+        self._async_deadline = 0
+
+    def _on_alert(self, pin):
+        self._ready = True
+
+    def _on_timer(self, t):
+        # One-shot timer callback (soft IRQ): conversion period elapsed, fetch result.
+        # If the conversion is still running (slow oscillator), check again in
+        # 1 ms rather than return the previous result, which may belong to
+        # another channel. Past the safety timeout, read whatever is there,
+        # as _convert() does.
+        try:
+            done = self._ready if self._alert is not None else not self._conversion_busy()
+            if not done and utime.ticks_diff(self._async_deadline, utime.ticks_ms()) > 0:
+                self._timer.init(mode=machine.Timer.ONE_SHOT, period=1, callback=self._on_timer_cb)
+                return
+            self._async_raw = self._read_conversion_raw()
+        except OSError as e:
+            self._async_err = e
+        self._async_ready = True
 
     def probe(self):
         """Return True if the device responds to a config register read."""
         try:
             # Try to read two bytes from the config register
+            self._ptr_is_conv = False
             self.i2c.readfrom_mem(self.address, _CONFIG_REG, 2)
             return True
         except Exception:
             return False
 
     def _write_config(self, cfg):
-        # cfg is a 16-bit integer, write big-endian
-        hi = (cfg >> 8) & 0xFF
-        lo = cfg & 0xFF
-        self.i2c.writeto_mem(self.address, _CONFIG_REG, bytes([hi, lo]))
+        # cfg is a 16-bit integer, written big-endian behind the pointer byte
+        buf = self._cfg_buf
+        buf[1] = (cfg >> 8) & 0xFF
+        buf[2] = cfg & 0xFF
+        self._ptr_is_conv = False
+        self.i2c.writeto(self.address, buf)
+
+    def _conversion_busy(self):
+        # OS bit reads 0 while a conversion is in progress
+        rx = self._rx_buf
+        self._ptr_is_conv = False
+        self.i2c.readfrom_mem_into(self.address, _CONFIG_REG, rx)
+        return not (rx[0] & (_OS_BIT >> 8))
 
     def _read_conversion_raw(self):
-        data = self.i2c.readfrom_mem(self.address, _CONVERSION_REG, 2)
-        hi, lo = data[0], data[1]
-        raw = (hi << 8) | lo
-        # signed 16-bit
-        if raw & 0x8000:
-            raw -= 1 << 16
-        return raw
+        # The pointer stays on the conversion register after a read, so a bare
+        # 2-byte read suffices unless something moved it. Otherwise do the
+        # pointer write + repeated START + read as one write-then-read call.
+        rx = self._rx_buf
+        if self._ptr_is_conv:
+            self.i2c.readfrom_into(self.address, rx)
+        else:
+            self.i2c.readfrom_mem_into(self.address, _CONVERSION_REG, rx)
+            self._ptr_is_conv = True
+        return _decode(rx)
+
+    def _convert(self, cfg, timeout_ms):
+        """Start a single-shot conversion with cfg and return the raw int16 result."""
+        deadline = utime.ticks_add(utime.ticks_ms(), timeout_ms)
+
+        # Write config to start conversion
+        self._ready = False
+        self._write_config(cfg)
+
+        # Wait for conversion-ready instead of sleeping a fixed period
+        if self._alert is not None:
+            while not self._ready:
+                if utime.ticks_diff(deadline, utime.ticks_ms()) <= 0:
+                    break
+                machine.idle()
+        else:
+            while self._conversion_busy():
+                if utime.ticks_diff(deadline, utime.ticks_ms()) <= 0:
+                    break
+                machine.idle()
+
+        return self._read_conversion_raw()
 
     def read_raw(self, channel=0, pga=PGA_4_096V, data_rate=DR_250SPS):
         """Perform a single-shot conversion and return raw int16 reading."""
@@ -98,34 +231,118 @@ class ADS1115:
             raise ValueError("ADS channel must be 0..3")
 
         # MUX for single-ended: 100 (AIN0), 101 (AIN1), 110 (AIN2), 111 (AIN3)
-        mux = 0x4000 | (channel << 12)
+        cfg = _compose_cfg(channel, pga, data_rate, self._comp)
+        return self._convert(cfg, _timeout_ms(data_rate))
 
-        # OS = 1 (start single conversion)
-        os = 0x8000
-        # Mode = single-shot (bit = 1 << 8)
-        mode_single = 0x0100
-        # Comparator disable (COMP_QUE = 0b11)
-        comp_disable = 0x0003
+    def read_voltage(self, channel):
+        """
+        Return voltage in volts for the given single-ended channel using the
+        PGA / data rate chosen at construction (no per-call table lookups).
+        """
+        cfg = self._default_cfg | (channel << 12)
+        return self._convert(cfg, self._default_timeout_ms) * self._default_lsb_v
 
-        cfg = os | mux | pga | mode_single | data_rate | comp_disable
+    def start_read(self, channel, pga=None, data_rate=None):
+        """
+        Non-blocking single-shot read: write the config and arm a one-shot
+        machine.Timer for one conversion period. The timer callback reads the
+        result; poll ready() and fetch it with last(). With pga/data_rate left
+        as None the precomputed constructor settings are used.
 
-        # Write config to start conversion
+        Do not issue blocking reads while busy() - they share the I2C bus and
+        the conversion register.
+        """
+        if pga is None and data_rate is None:
+            cfg = self._default_cfg | (channel << 12)
+            period_ms = self._default_period_ms
+            timeout_ms = self._default_timeout_ms
+            self._async_lsb_v = self._default_lsb_v
+        else:
+            if pga is None:
+                pga = self.pga
+            if data_rate is None:
+                data_rate = self.data_rate
+            cfg = _compose_cfg(channel, pga, data_rate, self._comp)
+            period_ms = _period_ms(data_rate)
+            timeout_ms = _timeout_ms(data_rate)
+            self._async_lsb_v = _fs_v(pga) / 32768.0
+
+        self._busy = True
+        self._async_ready = False
+        self._async_err = None
+        self._async_deadline = utime.ticks_add(utime.ticks_ms(), timeout_ms)
+        self._ready = False
         self._write_config(cfg)
+        self._timer.init(mode=machine.Timer.ONE_SHOT, period=period_ms, callback=self._on_timer_cb)
+
+    def busy(self):
+        """True from start_read() until last() collects the result."""
+        return self._busy
+
+    def ready(self):
+        """True once the conversion started by start_read() has been fetched."""
+        return self._async_ready
 
-        # Wait for conversion to complete: 1/sps plus small margin
-        sps = _DR_SPS.get(data_rate, 128)
-        wait_ms = int(1000.0 / float(sps)) + 2
-        utime.sleep_ms(wait_ms)
+    def last(self):
+        """Return the start_read() result in volts and free the ADC for the next read."""
+        self._busy = False
+        self._async_ready = False
+        if self._async_err is not None:
+            raise self._async_err
+        return self._async_raw * self._async_lsb_v
 
-        raw = self._read_conversion_raw()
-        return raw
+    def start_continuous(self, channel, pga=None, data_rate=None):
+        """
+        Put the ADS1115 in continuous-conversion mode on one channel (MODE = 0).
+        Conversions then run back to back and read_last() fetches the newest
+        result without a config write or conversion wait.
+
+        Trade-off: the channel/PGA/rate are fixed until the next config write.
+        Any read_raw()/read_voltage() call writes a single-shot config and so
+        leaves continuous mode; call start_continuous() again afterwards.
+        """
+        if channel not in (0, 1, 2, 3):
+            raise ValueError("ADS channel must be 0..3")
+        if pga is None:
+            pga = self.pga
+        if data_rate is None:
+            data_rate = self.data_rate
 
-    def read_voltage(self, channel=0, pga=PGA_4_096V, data_rate=DR_250SPS):
-        """Return voltage in volts for the given single-ended channel."""
-        raw = self.read_raw(channel=channel, pga=pga, data_rate=data_rate)
-        fs = _PGA_FS_V.get(pga, 4.096)
+        self._cont_lsb_v = _fs_v(pga) / 32768.0
+        self._write_config(_compose_cfg(channel, pga, data_rate, self._comp) & ~0x0100)
+
+    def read_last(self):
+        """Return the latest continuous-mode conversion in volts (no wait)."""
+        return self._read_conversion_raw() * self._cont_lsb_v
+
+    def _pair_params(self, pga, data_rate):
+        # (config base, timeout, LSB volts) shared by every conversion of a pair
+        if pga == self.pga and data_rate == self.data_rate:
+            return self._default_cfg, self._default_timeout_ms, self._default_lsb_v
+        return (_compose_cfg(0, pga, data_rate, self._comp), _timeout_ms(data_rate),
+                _fs_v(pga) / 32768.0)
+
+    @micropython.native
+    def read_avg_pair(self, ch_a, ch_b, pga, data_rate, n):
+        """
+        n alternating A/B conversions averaged in the driver. Raw counts are
+        summed as integers and scaled once. Returns (mean_volts_a, mean_volts_b).
+        """
+        base, timeout_ms, lsb_v = self._pair_params(pga, data_rate)
+        cfg_a = base | (ch_a << 12)
+        cfg_b = base | (ch_b << 12)
+        convert = self._convert
+        sum_a = 0
+        sum_b = 0
+        for _ in range(n):
+            sum_a += convert(cfg_a, timeout_ms)
+            sum_b += convert(cfg_b, timeout_ms)
+        k = lsb_v / n
+        return sum_a * k, sum_b * k
+
+    def read_voltage_cfg(self, channel, pga, data_rate):
+        """Slow path: voltage for an explicit PGA / data rate."""
+        raw = self.read_raw(channel, pga, data_rate)
         # ADS1115 is signed 16-bit, full-scale corresponds to +/- FS
         # LSB = FS / 32768
-        volts = (raw * fs) / 32768.0
-        return volts
-
+        return raw * (_fs_v(pga) / 32768.0)
@@ -18,7 +18,13 @@ class BandSwitch:
 
         # --- Outputs (push-pull) ---
         self.pins = [Pin(gp, Pin.OUT) for gp in cfg.BAND_GPIO_PINS]
-        self._active_high = getattr(cfg, "BAND_ACTIVE_HIGH", True)
+        # Precomputed ON/OFF pin levels (BAND_ACTIVE_HIGH False => active-low hardware)
+        active_high = bool(getattr(cfg, "BAND_ACTIVE_HIGH", True))
+        self._on_val = 1 if active_high else 0
+        self._off_val = 1 - self._on_val
+        self._btn_active_low = cfg.BAND_BUTTON_ACTIVE_LOW
+        self._debounce_ms = cfg.BAND_BUTTON_DEBOUNCE_MS
+        self._ticks_diff = utime.ticks_diff
 
         # Default selection
         self.index = int(getattr(cfg, "BAND_DEFAULT_INDEX", 0)) % len(self.pins)
@@ -29,69 +35,55 @@ class BandSwitch:
         else:
             self.btn = Pin(cfg.BAND_BUTTON_GPIO, Pin.IN, Pin.PULL_DOWN)
 
-        # Debounce state
-        self._last_level = self.btn.value()
-        self._last_change_ms = utime.ticks_ms()
-        self._press_consumed = False
+        # Debounce state (candidate level, its timer, committed level)
+        self._cand = self.btn.value()
+        self._timer = utime.ticks_ms()
+        self._committed = self._cand
 
         # Apply initial outputs
         self._apply_outputs()
 
     def _btn_is_pressed(self, level):
-        return (level == 0) if self.cfg.BAND_BUTTON_ACTIVE_LOW else (level == 1)
-
-    def _drive_pin(self, pin, on):
-        """
-        Drive output pin ON/OFF using simple push-pull logic.
-        If BAND_ACTIVE_HIGH is True:  ON=1, OFF=0
-        If BAND_ACTIVE_HIGH is False: ON=0, OFF=1 (active-low hardware)
-        """
-        pin.value(1 if on else 0) if self._active_high else pin.value(0 if on else 1)
+        return (level == 0) if self._btn_active_low else (level == 1)
 
     def _apply_outputs(self):
-        # Force all OFF, then selected ON (one-hot)
+        # Force all OFF, then selected ON (one-hot, break-before-make)
+        off_v = self._off_val
         for p in self.pins:
-            self._drive_pin(p, on=False)
-        self._drive_pin(self.pins[self.index], on=True)
+            p.value(off_v)
+        self.pins[self.index].value(self._on_val)
 
     def _debounced_press_event(self, now_ms):
         """
         Returns True exactly once per valid press (debounced, one-shot).
+
+        Deferred global debounce (QMK sym_defer_g): any change of the raw level
+        restarts a single timer; the candidate level is committed only once it
+        has been stable for the debounce interval. A press event is reported
+        when the committed level changes to the pressed level.
         """
         level = self.btn.value()
 
-        # Edge detection
-        if level != self._last_level:
-            self._last_level = level
-            self._last_change_ms = now_ms
+        if level != self._cand:
+            self._cand = level
+            self._timer = now_ms
             return False
 
-        # Require stable level for debounce interval
-        if utime.ticks_diff(now_ms, self._last_change_ms) < self.cfg.BAND_BUTTON_DEBOUNCE_MS:
+        if level == self._committed:
             return False
 
-        pressed = self._btn_is_pressed(level)
-
-        # One event per press
-        if pressed and not self._press_consumed:
-            self._press_consumed = True
-            return True
-
-        # On release, allow next press
-        if not pressed:
-            self._press_consumed = False
+        if self._ticks_diff(now_ms, self._timer) < self._debounce_ms:
+            return False
 
-        return False
+        self._committed = level
+        return self._btn_is_pressed(level)
 
-    def update(self, now_ms=None):
+    def update(self, now_ms):
         """
-        Call frequently from main loop.
+        Call frequently from main loop with the pass's ticks_ms().
         Advances band selection on each button press.
         Returns current index.
         """
-        if now_ms is None:
-            now_ms = utime.ticks_ms()
-
         if self._debounced_press_event(now_ms):
             self.index = (self.index + 1) % len(self.pins)
             self._apply_outputs()
@@ -110,5 +102,6 @@ class BandSwitch:
         """
         Force all relays OFF.
         """
+        off_v = self._off_val
         for p in self.pins:
-            self._drive_pin(p, on=False)
+            p.value(off_v)
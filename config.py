@@ -8,6 +8,7 @@ I2C_SCL_PIN = 17
 I2C_SDA_PIN = 16
 I2C_FREQ_HZ = 400_000
 ADS1115_ADDR = 0x48
+ADS_ALERT_GPIO = None   # GPIO wired to ADS1115 ALERT/RDY (None = poll the OS bit instead)
 
 # --- ADS1115 channels ---
 ADS_FWD_CH = 3
@@ -29,11 +30,17 @@ VCC_SCALE = 15.05
 CURRENT_OFFSET_V = 0.5
 CURRENT_V_PER_A  = 0.1
 
+# IIR filter coefficients for the Pico ADC readings (0<alpha<=1, higher = faster, noisier)
+CURRENT_IIR_ALPHA = 0.2
+VCC_IIR_ALPHA = 0.2
+
 # --- Processing cadence ---
 SWR_AVG_WINDOW_MS = 10
 PRINT_PERIOD_MS = 500
 FAST_TELEM_MS = 10
 THERM_TELEM_MS = 500
+LOOP_MAX_IDLE_MS = 5   # longest idle sleep between deadlines (bounds PTT/reset latency)
+LOOP_LIGHTSLEEP = False  # idle in machine.lightsleep (lower power; USB serial may drop while asleep)
 
 # --- Calibration files ---
 SWR_TABLE_PATH = "swr_table.csv"
@@ -14,12 +14,44 @@
 import utime
 
 
+class ControlState:
+    """
+    Control state returned by AmpControl.update(). One instance is owned by
+    AmpControl and updated in place each call; main.py fills band_idx / ptt.
+    """
+    __slots__ = ("disable", "amp_enabled", "tripped", "reason", "band_idx", "ptt")
+
+    def __init__(self, band_idx=0):
+        self.disable = True        # True => force amp OFF (assert disable output)
+        self.amp_enabled = False   # requested enable (if not tripped)
+        self.tripped = False
+        self.reason = "OK"
+        self.band_idx = band_idx
+        self.ptt = False
+
+
 class AmpControl:
     def __init__(self, cfg):
         self.cfg = cfg
-        
+
+        # Cached config values (avoid per-call attribute lookups)
+        self._reset_active_low = cfg.RESET_ACTIVE_LOW
+        self._debounce_ms = cfg.RESET_DEBOUNCE_MS
+        self._trip_debounce_ms = cfg.PROTECT_TRIP_DEBOUNCE_MS
+        self._therm_debounce_ms = cfg.PROTECT_THERM_DEBOUNCE_MS
+        self._vmax = cfg.PROTECT_VDRAIN_MAX_V
+        # Current thresholds in integer mA, power in mW (iDrain_ma is an int)
+        self._imax_ma = int(cfg.PROTECT_IDRAIN_MAX_A * 1000)
+        self._min_i_for_eff_ma = int(cfg.PROTECT_MIN_I_FOR_EFF_A * 1000)
+        self._min_total_p_mw = cfg.PROTECT_MIN_TOTAL_POWER_W * 1000.0
+        self._fwd_min_fraction_mw = cfg.PROTECT_FWD_MIN_FRACTION * 0.001
+        self._temp_max = cfg.PROTECT_TEMP_MAX_C
+        self._ticks_diff = utime.ticks_diff
+
         self._therm_start_ms = None
 
+        # Reused result object (see ControlState)
+        self.state = ControlState(getattr(cfg, "BAND_DEFAULT_INDEX", 0))
 
         # Default: amp OFF at boot
         self.amp_enabled = False
@@ -30,85 +62,85 @@ class AmpControl:
 
         # Debounce state
         self._fault_start_ms = None
-        self._btn_last_level = None
-        self._btn_last_change_ms = None
-        self._btn_press_consumed = False  # ensures one action per press
+        self._btn_cand = None       # raw level being timed
+        self._btn_timer = None
+        self._btn_committed = None  # last debounced level
 
     def _btn_is_pressed(self, level):
         # level is raw GPIO read (0/1)
-        return (level == 0) if self.cfg.RESET_ACTIVE_LOW else (level == 1)
+        return (level == 0) if self._reset_active_low else (level == 1)
 
-    def _fault_reason(self, telemetry):
-        v_drain = telemetry["vDrain"]
-        i_drain = telemetry["iDrain"]
-        vcc     = telemetry["vcc"]
-        pfwd    = telemetry["pfwd_w"]
+    def _electrical_fault(self, telemetry):
+        """
+        Instantaneous electrical fault check, cheapest test first.
+        Returns (True, reason) or (False, None).
 
-        if v_drain > self.cfg.PROTECT_VDRAIN_MAX_V:
+        Thermal protection (THERM_OT) is handled only in update(), with its own
+        slow debounce.
+        """
+        if telemetry.vDrain > self._vmax:
             return True, "VDRAIN_OV"
 
-        if i_drain > self.cfg.PROTECT_IDRAIN_MAX_A:
+        i_ma = telemetry.iDrain_ma
+        if i_ma > self._imax_ma:
             return True, "IDRAIN_OC"
 
-        total_p = vcc * i_drain
-        if (i_drain >= self.cfg.PROTECT_MIN_I_FOR_EFF_A) and (total_p >= self.cfg.PROTECT_MIN_TOTAL_POWER_W):
-            min_pfwd = self.cfg.PROTECT_FWD_MIN_FRACTION * total_p
-            if pfwd < min_pfwd:
-                return True, "FWD_LOW_VS_VI"
-
-        return False, "OK"
+        # Efficiency check only above the minimum current; vcc, pfwd and the
+        # products are not needed on the common low-current path
+        if i_ma >= self._min_i_for_eff_ma:
+            total_mw = telemetry.vcc * i_ma
+            if total_mw >= self._min_total_p_mw:
+                if telemetry.pfwd_w < self._fwd_min_fraction_mw * total_mw:
+                    return True, "FWD_LOW_VS_VI"
 
+        return False, None
 
     def _debounced_button_event(self, now_ms, level):
         """
         Returns True exactly once per debounced press.
+
+        Deferred global debounce (QMK sym_defer_g), same as BandSwitch:
+        restart the timer on any raw change, commit once stable, and report
+        a press when the committed level becomes the pressed level.
         """
-        if self._btn_last_level is None:
-            self._btn_last_level = level
-            self._btn_last_change_ms = now_ms
+        if self._btn_cand is None:
+            self._btn_cand = level
+            self._btn_committed = level
+            self._btn_timer = now_ms
             return False
 
-        if level != self._btn_last_level:
-            self._btn_last_level = level
-            self._btn_last_change_ms = now_ms
-            self._btn_press_consumed = False
+        if level != self._btn_cand:
+            self._btn_cand = level
+            self._btn_timer = now_ms
             return False
 
-        # Stable level for >= debounce interval
-        if utime.ticks_diff(now_ms, self._btn_last_change_ms) < self.cfg.RESET_DEBOUNCE_MS:
+        if level == self._btn_committed:
             return False
 
-        pressed = self._btn_is_pressed(level)
-
-        # One event per press
-        if pressed and not self._btn_press_consumed:
-            self._btn_press_consumed = True
-            return True
-
-        # When released, allow next press to generate event
-        if not pressed:
-            self._btn_press_consumed = False
+        if self._ticks_diff(now_ms, self._btn_timer) < self._debounce_ms:
+            return False
 
-        return False
+        self._btn_committed = level
+        return self._btn_is_pressed(level)
 
     def update(self, telemetry, now_ms, reset_btn_level):
         """
-        Returns a dict describing the control state:
-          {
-            "disable": bool,        # True => force amp OFF (assert disable output)
-            "amp_enabled": bool,    # requested enable (if not tripped)
-            "tripped": bool,
-            "reason": str
-          }
+        telemetry: telemetry.Telemetry instance (all fields always populated;
+        read as plain attributes).
+
+        Returns self.state (ControlState), updated in place:
+          disable, amp_enabled, tripped, reason
         """
+        ticks_diff = self._ticks_diff
+
         # 1) Evaluate electrical protection (fast debounce) and latch on trip
-        is_fault, reason = self._fault_reason(telemetry)
+        is_fault, reason = self._electrical_fault(telemetry)
 
         if not self.tripped:
             if is_fault:
                 if self._fault_start_ms is None:
                     self._fault_start_ms = now_ms
-                elif utime.ticks_diff(now_ms, self._fault_start_ms) >= self.cfg.PROTECT_TRIP_DEBOUNCE_MS:
+                elif ticks_diff(now_ms, self._fault_start_ms) >= self._trip_debounce_ms:
                     self.tripped = True
                     self.last_reason = reason
                     self.amp_enabled = False
@@ -116,14 +148,14 @@ class AmpControl:
                 self._fault_start_ms = None
 
         # 2) Thermal protection (slow debounce) - trips only if sustained overtemp
-        temp_c = telemetry["temp_c"]
-        overtemp = temp_c >= self.cfg.PROTECT_TEMP_MAX_C
+        temp_c = telemetry.temp_c
+        overtemp = temp_c >= self._temp_max
 
         if not self.tripped:
             if overtemp:
                 if self._therm_start_ms is None:
                     self._therm_start_ms = now_ms
-                elif utime.ticks_diff(now_ms, self._therm_start_ms) >= self.cfg.PROTECT_THERM_DEBOUNCE_MS:
+                elif ticks_diff(now_ms, self._therm_start_ms) >= self._therm_debounce_ms:
                     self.tripped = True
                     self.last_reason = "THERM_OT"
                     self.amp_enabled = False
@@ -147,11 +179,9 @@ class AmpControl:
                 self.amp_enabled = not self.amp_enabled
 
         # 4) Determine output disable state
-        disable = (not self.amp_enabled) or self.tripped
-
-        return {
-            "disable": disable,
-            "amp_enabled": self.amp_enabled,
-            "tripped": self.tripped,
-            "reason": (self.last_reason if self.tripped else "OK")
-        }
+        st = self.state
+        st.disable = (not self.amp_enabled) or self.tripped
+        st.amp_enabled = self.amp_enabled
+        st.tripped = self.tripped
+        st.reason = self.last_reason if self.tripped else "OK"
+        return st
@@ -1,12 +1,37 @@
 # current_sense.py
+# Drain current sense on a Pico ADC channel, in integer milliamps.
+#
+# The hot path is pure integer math (Q12 scale, Q4 filter state); floats
+# only appear in the read_current() compatibility wrapper.
+
 from machine import ADC
 
 class CurrentSense:
-    def __init__(self, adc_channel=1, vref=3.3, offset_v=0.5, v_per_a=0.1):
+    def __init__(self, adc_channel=1, vref=3.3, offset_v=0.5, v_per_a=0.1, alpha=0.2):
+        """
+        alpha: IIR coefficient applied across read_current_ma() calls (0<alpha<=1).
+        Higher = faster response, noisier.
+        """
         self.adc = ADC(adc_channel)
-        self._K = vref / (65535.0 * v_per_a)
-        self._offset = offset_v / v_per_a
+        # Sensor offset in raw ADC counts
+        self._offset_raw = int(offset_v * 65535 / vref)
+        # mA per raw count, Q12 (keeps 65535 * k inside a small int)
+        self._k_ma_q12 = int((vref * 1000.0) / (65535.0 * v_per_a) * 4096.0 + 0.5)
+        # IIR coefficient, Q8
+        self._alpha_q8 = int(alpha * 256.0 + 0.5)
+        # Filter state in mA, Q4
+        self._acc_q4 = 0
+
+    def read_adc_raw(self):
+        # 4x oversample, box average
+        read = self.adc.read_u16
+        return (read() + read() + read() + read()) >> 2
+
+    def read_current_ma(self):
+        d = self.read_adc_raw() - self._offset_raw
+        ma_q4 = ((d * self._k_ma_q12) >> 8) if d > 0 else 0
+        self._acc_q4 += ((ma_q4 - self._acc_q4) * self._alpha_q8) >> 8
+        return self._acc_q4 >> 4
 
     def read_current(self):
-        amps = self.adc.read_u16() * self._K - self._offset
-        return amps if amps > 0.0 else 0.0
+        return self.read_current_ma() * 0.001
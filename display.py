@@ -1,11 +1,19 @@
 # display.py
-# Updated LCD renderer for 16x2 I2C LCD.
+# LCD renderer for 16x2 or 20x4 I2C LCD (layout chosen from display_config.LCD_ROWS).
 
 import utime
+import micropython
 import display_config as dc
 from lcd_i2c import LCD2004
 
 
+# %-format per decimals count (index = decimals); "%d" path is used for 0
+_FMTS = ("%d", "%.1f", "%.2f", "%.3f")
+_INF = float("inf")
+_SWR_INF_S = dc.SWR_INF_TEXT.rjust(4)
+
+
+@micropython.native
 def _clamp_str(s, width=16):
     s = "" if s is None else str(s)
     if len(s) < width:
@@ -13,14 +21,50 @@ def _clamp_str(s, width=16):
     return s[:width]
 
 
+def _write_field(buf, off, s):
+    """Copy ASCII text s into buf starting at off, clipped to the buffer. Returns the new offset."""
+    n = len(buf)
+    for ch in s:
+        if off >= n:
+            break
+        buf[off] = ord(ch)
+        off += 1
+    return off
+
+
+def _pad(buf, off):
+    # Blank the remainder of the line buffer
+    for i in range(off, len(buf)):
+        buf[i] = 0x20
+
+
+def _split_template(tpl, keys):
+    """
+    Split a line template around its {key} fields, which must appear in the
+    given order. Returns len(keys) + 1 fixed fragments for plain concatenation.
+    """
+    parts = []
+    rest = tpl
+    for k in keys:
+        field = "{" + k + "}"
+        i = rest.find(field)
+        if i < 0:
+            raise ValueError("Display template missing or misordered field: " + field)
+        parts.append(rest[:i])
+        rest = rest[i + len(field):]
+    parts.append(rest)
+    return parts
+
+
+@micropython.native
 def _fmt_num(val, width, decimals=1):
-    try:
-        if decimals == 0:
-            s = "{:d}".format(int(val))
-        else:
-            s = ("{0:." + str(decimals) + "f}").format(float(val))
-    except:
+    # Explicit guards instead of try/except: non-numbers, NaN and +/-inf show "?"
+    if not isinstance(val, (int, float)) or val != val or val == _INF or val == -_INF:
         s = "?"
+    elif decimals == 0:
+        s = "%d" % int(val)
+    else:
+        s = _FMTS[decimals] % val
     if len(s) < width:
         s = (" " * (width - len(s))) + s
     else:
@@ -28,20 +72,22 @@ def _fmt_num(val, width, decimals=1):
     return s
 
 
+@micropython.native
 def _fmt_swr(swr):
-    try:
-        if swr == float("inf"):
-            return dc.SWR_INF_TEXT.rjust(4)
-        if swr > 99.9:
-            return "99.9".rjust(4)
-        return _fmt_num(swr, width=4, decimals=1)
-    except:
+    if not isinstance(swr, (int, float)) or swr != swr:
         return " ?  "
+    if swr == _INF:
+        return _SWR_INF_S
+    if swr > 99.9:
+        return "99.9"
+    return _fmt_num(swr, 4, 1)
 
 
 class Display:
     """
-    Minimal display wrapper for 16x2 LCD.
+    Minimal display wrapper for 16x2 / 20x4 LCD.
+    Rows 0-1 always show RF and drain values; with LCD_ROWS >= 4,
+    rows 2-3 add temperature/Vcc and amp/protection status.
     Call update(latest, state, now_ms) periodically.
     """
 
@@ -49,60 +95,129 @@ class Display:
         self.lcd = LCD2004(i2c, addr=addr)
         self.refresh_ms = refresh_ms
         self._t_last = utime.ticks_ms()
+        self.rows = dc.LCD_ROWS
+        self.cols = dc.LCD_COLS
+
+        # Pre-split line templates (no str.format parsing per refresh)
+        self._l0 = _split_template(dc.LINE0, ("swr", "pfwd", "band"))
+        self._l1 = _split_template(dc.LINE1, ("id", "vd"))
+        if self.rows >= 4:
+            self._l2 = _split_template(dc.LINE2, ("temp", "vcc"))
+            self._l3 = _split_template(dc.LINE3, ("status",))
+
+        # Preallocated line buffers; _last holds what each LCD row shows now
+        # so unchanged rows are not rewritten over I2C
+        self._buf = [bytearray(b" " * self.cols) for _ in range(self.rows)]
+        self._last = [bytearray(b" " * self.cols) for _ in range(self.rows)]
+        self._last_key = None
 
         # Init splash, then clear
         self.lcd.clear()
-        # Fit startup lines into 16 characters
-        self.lcd.write_line(0, _clamp_str("HF Amp Controller", dc.LCD_COLS))
-        self.lcd.write_line(1, _clamp_str("Display init OK", dc.LCD_COLS))
+        # Fit startup lines into the configured width
+        self.lcd.write_line(0, _clamp_str("HF Amp Controller", self.cols))
+        self.lcd.write_line(1, _clamp_str("Display init OK", self.cols))
         utime.sleep_ms(500)
         self.lcd.clear()
 
-    def should_refresh(self, now_ms=None):
-        if now_ms is None:
-            now_ms = utime.ticks_ms()
+    def should_refresh(self, now_ms):
         return utime.ticks_diff(now_ms, self._t_last) >= self.refresh_ms
 
-    def update(self, latest, state, now_ms=None):
+    def update(self, latest, state, now_ms):
         """
-        latest: dict with telemetry (pfwd_w, prfl_w, swr, vDrain, iDrain, temp_c, ...)
-        state: dict from AmpControl.update(); expects 'band_idx' key (0..2)
+        latest: telemetry.Telemetry (pfwd_w, prfl_w, swr, vDrain, iDrain_ma, temp_c, ...)
+        state: control.ControlState from AmpControl.update(); band_idx (0..2) set by main
+        now_ms: utime.ticks_ms() captured once per main-loop pass
         """
-        if now_ms is None:
-            now_ms = utime.ticks_ms()
-
         if not self.should_refresh(now_ms):
             return
 
         self._t_last = now_ms
 
-        # Telemetry defaults
-        pfwd = latest.get("pfwd_w", 0.0)
-        swr = latest.get("swr", float("inf"))
-        vd = latest.get("vDrain", 0.0)
-        id_a = latest.get("iDrain", 0.0)
+        # Telemetry
+        pfwd = latest.pfwd_w
+        swr = latest.swr
+        vd = latest.vDrain
+        id_ma = latest.iDrain_ma
+        band_idx = state.band_idx if state is not None else 0
+
+        # Coarse dirty check at display resolution: skip all formatting when
+        # nothing visible can have changed (per-row compare still guards I2C).
+        # Each key term rounds exactly like the field it stands for.
+        pfwd_w = int(pfwd)           # whole watts, truncated
+        id_da = (id_ma + 50) // 100  # tenths of an amp, to nearest
+        key = (pfwd_w, round(swr, 1), round(vd, 1), id_da, band_idx)
+        if self.rows >= 4:
+            key += (round(latest.temp_c, 1), round(latest.vcc, 1))
+            if state is not None:
+                key += (state.tripped, state.amp_enabled, state.reason)
+        if key == self._last_key:
+            return
+        self._last_key = key
+
+        id_a = id_da * 0.1
 
         # Format values
-        pfwd_s = _fmt_num(pfwd, width=4, decimals=0)   # integer W
+        pfwd_s = _fmt_num(pfwd_w, width=4, decimals=0)  # integer W
         swr_s = _fmt_swr(swr)                          # width 4
         id_s = _fmt_num(id_a, width=4, decimals=1)     # A with 1 decimal
         vd_s = _fmt_num(vd, width=4, decimals=1)       # V with 1 decimal
 
         # Band label
-        band_idx = int(state.get("band_idx", 0)) if state is not None else 0
-        try:
-            band_label = dc.BAND_LABELS[band_idx]
-        except:
-            band_label = dc.BAND_LABELS[0]
-
-        # Build lines from templates and clamp
-        line0 = dc.LINE0.format(swr=swr_s, pfwd=pfwd_s, band=band_label)
-        line1 = dc.LINE1.format(id=id_s, vd=vd_s)
-
-        line0 = _clamp_str(line0, dc.LCD_COLS)
-        line1 = _clamp_str(line1, dc.LCD_COLS)
-
-        # Write to the LCD
-        self.lcd.write_line(0, line0)
-        if dc.LCD_ROWS > 1:
-            self.lcd.write_line(1, line1)
+        labels = dc.BAND_LABELS
+        band_label = labels[band_idx] if 0 <= band_idx < len(labels) else labels[0]
+
+        # Compose rows in place into the preallocated line buffers
+        buf = self._buf[0]
+        p = self._l0
+        off = _write_field(buf, 0, p[0])
+        off = _write_field(buf, off, swr_s)
+        off = _write_field(buf, off, p[1])
+        off = _write_field(buf, off, pfwd_s)
+        off = _write_field(buf, off, p[2])
+        off = _write_field(buf, off, band_label)
+        _pad(buf, _write_field(buf, off, p[3]))
+        self._flush_row(0)
+
+        if self.rows > 1:
+            buf = self._buf[1]
+            p = self._l1
+            off = _write_field(buf, 0, p[0])
+            off = _write_field(buf, off, id_s)
+            off = _write_field(buf, off, p[1])
+            off = _write_field(buf, off, vd_s)
+            _pad(buf, _write_field(buf, off, p[2]))
+            self._flush_row(1)
+
+        if self.rows >= 4:
+            temp_s = _fmt_num(latest.temp_c, width=4, decimals=1)
+            vcc_s = _fmt_num(latest.vcc, width=4, decimals=1)
+            if state is None:
+                status = ""
+            elif state.tripped:
+                status = "TRIP:" + state.reason
+            else:
+                status = "AMP ON" if state.amp_enabled else "AMP OFF"
+
+            buf = self._buf[2]
+            p = self._l2
+            off = _write_field(buf, 0, p[0])
+            off = _write_field(buf, off, temp_s)
+            off = _write_field(buf, off, p[1])
+            off = _write_field(buf, off, vcc_s)
+            _pad(buf, _write_field(buf, off, p[2]))
+            self._flush_row(2)
+
+            buf = self._buf[3]
+            p = self._l3
+            off = _write_field(buf, 0, p[0])
+            off = _write_field(buf, off, status)
+            _pad(buf, _write_field(buf, off, p[1]))
+            self._flush_row(3)
+
+    def _flush_row(self, row):
+        # Send the row only if it differs from what the LCD already shows
+        buf = self._buf[row]
+        last = self._last[row]
+        if buf != last:
+            self.lcd.write_line(row, buf)
+            last[:] = buf
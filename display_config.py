@@ -1,8 +1,9 @@
 # display_config.py
 # LCD display configuration (16x2 over I2C backpack)
 
-# Hardware
+# Hardware (16x2; set 20/4 for a 20x4 module to enable rows 2-3)
 LCD_I2C_ADDR = 0x27
+LCD_I2C_FREQ_HZ = 400_000   # fast-mode; drop to 100_000 if a backpack misbehaves
 LCD_COLS = 16
 LCD_ROWS = 2
 
@@ -25,3 +26,10 @@ BAND_LABELS = ("10", "20", "40")
 #   band - band label ("40"/"20"/"10")
 LINE0 = "S:{swr} P:{pfwd}W B:{band}"
 LINE1 = "I:{id}A D:{vd}V"
+
+# Extra rows for 20x4 modules (used only when LCD_ROWS >= 4):
+#   temp - 4-char heatsink temperature C (1 decimal)
+#   vcc - 4-char supply voltage (1 decimal)
+#   status - "AMP ON" / "AMP OFF" / "TRIP:<reason>"
+LINE2 = "T:{temp}C Vcc:{vcc}V"
+LINE3 = "{status}"
@@ -1,5 +1,11 @@
 # interp.py
 # Shared piecewise-linear interpolator used by swr_calc and thermistor.
+#
+# Breakpoints are stored as array('f') (compact, fast subscript) together with
+# the per-segment slopes, so interp() (native emitter) needs no division.
+
+import micropython
+from array import array
 
 
 class PiecewiseLinear:
@@ -7,12 +13,20 @@ class PiecewiseLinear:
         if len(x) != len(y) or len(x) < 2:
             raise ValueError("Need >=2 points with matching x/y lengths")
         pairs = sorted(zip(x, y), key=lambda t: t[0])
-        self.x = [p[0] for p in pairs]
-        self.y = [p[1] for p in pairs]
+        self.x = array("f", [p[0] for p in pairs])
+        self.y = array("f", [p[1] for p in pairs])
+        # Slope of each segment; 0 for duplicate x (returns the left y)
+        x, y = self.x, self.y
+        self.m = array("f", [
+            (y[i + 1] - y[i]) / (x[i + 1] - x[i]) if x[i + 1] != x[i] else 0.0
+            for i in range(len(x) - 1)
+        ])
 
+    @micropython.native
     def interp(self, xq):
         x = self.x
         y = self.y
+        m = self.m
         if xq <= x[0]:
             return y[0]
         if xq >= x[-1]:
@@ -25,8 +39,4 @@ class PiecewiseLinear:
                 lo = mid
             else:
                 hi = mid
-        x0, x1 = x[lo], x[hi]
-        if x1 == x0:
-            return y[lo]
-        t = (xq - x0) / (x1 - x0)
-        return y[lo] + t * (y[hi] - y[lo])
+        return y[lo] + (xq - x[lo]) * m[lo]
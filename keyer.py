@@ -10,7 +10,7 @@ class Keyer:
 
     Usage:
       k = Keyer(pin_no, active_low=True, pull="UP")
-      k.update()        # call in fast loop
+      k.update(now_ms)  # call in fast loop with the pass's ticks_ms()
       if k.is_keyed():  # check PTT/key state
           ...
     """
@@ -21,22 +21,26 @@ class Keyer:
         self._last = self.gpio.value()
         self._debounce_ms = 10
         self._last_change = utime.ticks_ms()
+        self._stable = False
         self._state = False
 
     def _is_active_level(self, level):
         return (level == 0) if self.active_low else (level == 1)
 
-    def update(self, now_ms=None):
-        if now_ms is None:
-            now_ms = utime.ticks_ms()
+    def update(self, now_ms):
         lvl = self.gpio.value()
-        if lvl != self._last:
+        if lvl == self._last:
+            if self._stable:
+                return
+        else:
             self._last = lvl
+            self._stable = False
             self._last_change = now_ms
             return
         if utime.ticks_diff(now_ms, self._last_change) < self._debounce_ms:
             return
+        self._stable = True
         self._state = self._is_active_level(lvl)
 
     def is_keyed(self):
-        return bool(self._state)
\ No newline at end of file
+        return bool(self._state)
@@ -10,6 +10,8 @@
 import utime
 from machine import I2C, Pin
 
+import display_config as dc
+
 # PCF8574 pin mapping commonly used on I2C LCD backpacks:
 # P0=RS, P1=RW, P2=E, P3=Backlight, P4..P7 = D4..D7
 _MASK_RS = 0x01
@@ -18,38 +20,84 @@ _MASK_E  = 0x04
 _MASK_BL = 0x08
 
 
+# Bytes per character on the wire: hi nibble E-high, E-low, E-low (hold),
+# lo nibble E-high, E-low, E-low (hold). The hold byte keeps E latches three
+# PCF8574 bytes apart (~67 us at 400 kHz), clear of the HD44780's 37 us
+# execution time even on slow-oscillator parts and clones.
+_BYTES_PER_CHAR = 6
+# One row transaction: set-cursor command + 20 characters
+_ROW_BYTES = 21 * _BYTES_PER_CHAR
+
+# 20x4 DDRAM row start addresses: Row0 0x00, Row1 0x40, Row2 0x14, Row3 0x54
+_ROW_OFFSETS = b"\x00\x40\x14\x54"
+
+# Init commands sent after the switch to 4-bit mode:
+# function set (4-bit, 2-line, 5x8), display on (cursor/blink off),
+# entry mode (increment, no shift), clear
+_INIT_CMDS = (0x28, 0x0C, 0x06, 0x01)
+
+
 class LCD2004:
     def __init__(self, i2c: I2C, addr: int = 0x27, backlight: bool = True):
         self.i2c = i2c
         self.addr = addr
         self.backlight = backlight
         self._bl = _MASK_BL if backlight else 0x00
-        self._init_lcd()
 
-    # ---------- Low-level I2C write ----------
-    def _write_byte(self, data: int):
-        self.i2c.writeto(self.addr, bytes([data]))
+        # Preallocated transmit buffers: a full row burst and a single command/char
+        self._tx = bytearray(_ROW_BYTES)
+        self._tx1 = bytearray(_BYTES_PER_CHAR)
 
-    # ---------- 4-bit bus helpers ----------
-    def _pulse_enable(self, data: int):
-        # Enable high -> low pulse to latch nibble
-        self._write_byte(data | _MASK_E)
-        utime.sleep_us(1)
-        self._write_byte(data & ~_MASK_E)
-        utime.sleep_us(50)
+        # Wire-byte lookup tables: _BYTES_PER_CHAR PCF8574 bytes per value, RS/BL folded in
+        self._lut_cmd = self._build_lut(0x00)
+        self._lut_data = self._build_lut(_MASK_RS)
+
+        self._init_lcd()
 
-    def _write4(self, nibble: int, rs: int):
-        # nibble is upper 4 bits already positioned (bits 4..7)
-        data = nibble | self._bl | ( _MASK_RS if rs else 0x00 )
-        self._write_byte(data)
-        self._pulse_enable(data)
+    # ---------- 4-bit bus helpers ----------
+    def _pack4(self, buf, off: int, nibble: int) -> int:
+        # One E-pulsed high nibble (command, RS=0) plus hold byte at buf[off];
+        # nibble is in bits 4..7
+        data = nibble | self._bl
+        buf[off] = data | _MASK_E
+        buf[off + 1] = data
+        buf[off + 2] = data
+        return off + 3
+
+    def _build_lut(self, rs_mask: int):
+        lut = bytearray(256 * _BYTES_PER_CHAR)
+        base = self._bl | rs_mask
+        for v in range(256):
+            hi = (v & 0xF0) | base
+            lo = ((v << 4) & 0xF0) | base
+            i = v * _BYTES_PER_CHAR
+            lut[i] = hi | _MASK_E
+            lut[i + 1] = hi
+            lut[i + 2] = hi
+            lut[i + 3] = lo | _MASK_E
+            lut[i + 4] = lo
+            lut[i + 5] = lo
+        return lut
+
+    def _pack(self, buf, off: int, value: int, rs: int) -> int:
+        # Copy one byte's two E-pulsed nibbles (6 PCF8574 bytes) to buf[off]
+        lut = self._lut_data if rs else self._lut_cmd
+        i = value * _BYTES_PER_CHAR
+        buf[off] = lut[i]
+        buf[off + 1] = lut[i + 1]
+        buf[off + 2] = lut[i + 2]
+        buf[off + 3] = lut[i + 3]
+        buf[off + 4] = lut[i + 4]
+        buf[off + 5] = lut[i + 5]
+        return off + _BYTES_PER_CHAR
 
     def _send(self, value: int, rs: int):
-        # Send high nibble then low nibble
-        hi = (value & 0xF0)
-        lo = ((value << 4) & 0xF0)
-        self._write4(hi, rs)
-        self._write4(lo, rs)
+        # One I2C transaction per byte (both nibbles, E pulses included).
+        # The I2C byte time already exceeds the E pulse width; only the
+        # HD44780 execution time needs an explicit wait.
+        self._pack(self._tx1, 0, value, rs)
+        self.i2c.writeto(self.addr, self._tx1)
+        utime.sleep_us(50)
 
     def command(self, cmd: int):
         self._send(cmd, rs=0)
@@ -60,30 +108,28 @@ class LCD2004:
     # ---------- LCD init / control ----------
     def _init_lcd(self):
         # HD44780 initialization sequence for 4-bit mode
+        tx = self._tx
         utime.sleep_ms(50)
 
-        # Force into 8-bit mode first (send 0x30 three times as high nibble)
-        self._write4(0x30, rs=0)
+        # Force into 8-bit mode first (0x30 three times as high nibble);
+        # each needs its own wait, so each is its own short transaction
+        mv = memoryview(tx)[:self._pack4(tx, 0, 0x30)]
+        self.i2c.writeto(self.addr, mv)
         utime.sleep_ms(5)
-        self._write4(0x30, rs=0)
+        self.i2c.writeto(self.addr, mv)
         utime.sleep_us(150)
-        self._write4(0x30, rs=0)
+        self.i2c.writeto(self.addr, mv)
         utime.sleep_us(150)
 
-        # Set to 4-bit mode (0x20 high nibble)
-        self._write4(0x20, rs=0)
-        utime.sleep_us(150)
-
-        # Function set: 4-bit, 2-line (works for 20x4), 5x8 font
-        self.command(0x28)
-
-        # Display on, cursor off, blink off
-        self.command(0x0C)
+        # One burst: 4-bit mode (0x20 high nibble), then the full commands.
+        # The hold bytes space the E latches past the 37 us execution time.
+        off = self._pack4(tx, 0, 0x20)
+        for cmd in _INIT_CMDS:
+            off = self._pack(tx, off, cmd, 0)
+        self.i2c.writeto(self.addr, memoryview(tx)[:off])
 
-        # Entry mode set: increment, no shift
-        self.command(0x06)
-
-        self.clear()
+        # Clear display (last init command) needs ~1.5 ms
+        utime.sleep_ms(2)
 
     def clear(self):
         self.command(0x01)
@@ -94,32 +140,50 @@ class LCD2004:
         utime.sleep_ms(2)
 
     # ---------- Positioning ----------
+    def _cursor_cmd(self, col: int, row: int) -> int:
+        row = 0 if row < 0 else 3 if row > 3 else row
+        col = 0 if col < 0 else 19 if col > 19 else col
+        return 0x80 | (_ROW_OFFSETS[row] + col)
+
     def set_cursor(self, col: int, row: int):
-        # 20x4 DDRAM addresses:
-        # Row0: 0x00, Row1: 0x40, Row2: 0x14, Row3: 0x54
-        row_offsets = [0x00, 0x40, 0x14, 0x54]
-        if row < 0:
-            row = 0
-        if row > 3:
-            row = 3
-        if col < 0:
-            col = 0
-        if col > 19:
-            col = 19
-        addr = 0x80 | (row_offsets[row] + col)
-        self.command(addr)
+        self.command(self._cursor_cmd(col, row))
 
     def write(self, text: str):
+        # Batched: up to 21 characters per I2C transaction
+        tx = self._tx
+        off = 0
         for ch in text:
-            self.write_char(ch)
+            off = self._pack(tx, off, ord(ch), 1)
+            if off >= _ROW_BYTES:
+                self.i2c.writeto(self.addr, tx)
+                off = 0
+        if off:
+            self.i2c.writeto(self.addr, memoryview(tx)[:off])
+        utime.sleep_us(50)
 
-    def write_line(self, row: int, text: str):
-        # Writes and pads/truncates to 20 chars
-        s = (text + " " * 20)[:20]
-        self.set_cursor(0, row)
-        self.write(s)
+    def write_line(self, row: int, text):
+        # Writes and pads/truncates to 20 chars in one I2C transaction
+        # (set-cursor command + characters); text may be str or ASCII bytes/bytearray
+        if isinstance(text, str):
+            text = text.encode()
+        tx = self._tx
+        self._pack(tx, 0, self._cursor_cmd(0, row), 0)
+        lut = self._lut_data
+        n = len(text)
+        off = _BYTES_PER_CHAR
+        for k in range(20):
+            i = (text[k] if k < n else 0x20) * _BYTES_PER_CHAR
+            tx[off] = lut[i]
+            tx[off + 1] = lut[i + 1]
+            tx[off + 2] = lut[i + 2]
+            tx[off + 3] = lut[i + 3]
+            tx[off + 4] = lut[i + 4]
+            tx[off + 5] = lut[i + 5]
+            off += _BYTES_PER_CHAR
+        self.i2c.writeto(self.addr, tx)
+        utime.sleep_us(50)
 
 
-def make_i2c_gp2_gp3(freq=100_000) -> I2C:
+def make_i2c_gp2_gp3(freq=dc.LCD_I2C_FREQ_HZ) -> I2C:
     # GP2= SDA, GP3= SCL => typically I2C(1) on Pico
     return I2C(1, sda=Pin(2), scl=Pin(3), freq=freq)
@@ -1,4 +1,5 @@
 from machine import I2C, Pin
+import machine
 import utime
 
 import a2d
@@ -9,6 +10,7 @@ import swr_calc
 import Vcc
 import control
 import thermistor
+import telemetry
 import band_switch
 import keyer
 import display
@@ -23,7 +25,13 @@ i2c = I2C(
     freq=config.I2C_FREQ_HZ
 )
 
-ads = a2d.ADS1115(i2c, address=config.ADS1115_ADDR)
+ads = a2d.ADS1115(
+    i2c,
+    address=config.ADS1115_ADDR,
+    alert_pin=config.ADS_ALERT_GPIO,
+    pga=config.ADS_PGA,
+    data_rate=config.ADS_DATA_RATE
+)
 if not ads.probe():
     raise RuntimeError("ADS1115 not found on I2C")
 
@@ -35,7 +43,8 @@ vdrain = v_drain.VDrain(
 isense = current_sense.CurrentSense(
     adc_channel=config.CURRENT_ADC_CH,
     offset_v=config.CURRENT_OFFSET_V,
-    v_per_a=config.CURRENT_V_PER_A
+    v_per_a=config.CURRENT_V_PER_A,
+    alpha=config.CURRENT_IIR_ALPHA
 )
 
 swr = swr_calc.SWRCalc(
@@ -59,11 +68,12 @@ temp = thermistor.ThermistorADS(
 
 vcc = Vcc.Vcc(
     adc_channel=config.VCC_ADC_CH,
-    scale=config.VCC_SCALE
+    scale=config.VCC_SCALE,
+    alpha=config.VCC_IIR_ALPHA
 )
 
 # --- LCD ---
-i2c_lcd = I2C(1, sda=Pin(2), scl=Pin(3), freq=100000)
+i2c_lcd = I2C(1, sda=Pin(2), scl=Pin(3), freq=dc.LCD_I2C_FREQ_HZ)
 disp = display.Display(i2c_lcd)
 
 # --- Control I/O ---
@@ -93,169 +103,232 @@ ctrl = control.AmpControl(config)
 # Default OFF at boot => assert disable output
 protect_out.value(1 if config.PROTECT_ACTIVE_HIGH else 0)
 
-# --- Scheduling ---
-t_print = utime.ticks_ms()
-t_fast = utime.ticks_ms()
-t_swr = utime.ticks_ms()
-t_therm = utime.ticks_ms()
-t_lcd = utime.ticks_ms()
-
-latest = {
-    "pfwd_w": 0.0,
-    "prfl_w": 0.0,
-    "swr": float("inf"),
-    "samples": 0,
-    "vDrain": 0.0,
-    "iDrain": 0.0,
-    "vcc": 0.0,
-    "temp_c": 0.0,
-    "ptt": False,
-
-    # keep RF volts as state (do NOT reset each loop)
-    "vfwd_v": 0.0,
-    "vrfl_v": 0.0,
-}
-
-state = {
-    "disable": True,
-    "amp_enabled": False,
-    "tripped": False,
-    "reason": "OK",
-    "band_idx": config.BAND_DEFAULT_INDEX,
-    "ptt": False,
-}
-
-band_idx = config.BAND_DEFAULT_INDEX
-
-# IIR filter coefficient for RF detector volts (0<alpha<=1). Higher = faster response, noisier.
-alpha = 0.2
-
-# --- Hot-path aliases / cached constants ---
-ticks_ms = utime.ticks_ms
-ticks_diff = utime.ticks_diff
-sleep_ms = utime.sleep_ms
-
-read_ptt = ptt.update
-is_keyed = ptt.is_keyed
-read_reset = reset_in.value
-update_band = bands.update
-update_ctrl = ctrl.update
-update_display = disp.update
-
-read_vdrain = vdrain.read_drain_voltage
-read_idrain = isense.read_current
-read_vcc = vcc.read_vcc_voltage
-read_temp = temp.read_temperature
-read_ads_voltage = ads.read_voltage
-interp_watts = swr.v_to_w.interp
-swr_from_powers = swr_calc.swr_from_powers
-
-fast_telem_ms = config.FAST_TELEM_MS
-swr_avg_window_ms = config.SWR_AVG_WINDOW_MS
-therm_telem_ms = config.THERM_TELEM_MS
-lcd_refresh_ms = dc.LCD_REFRESH_MS
-print_period_ms = config.PRINT_PERIOD_MS
-
-ads_fwd_ch = config.ADS_FWD_CH
-ads_rfl_ch = config.ADS_RFL_CH
-ads_pga = config.ADS_PGA
-ads_data_rate = config.ADS_DATA_RATE
-
-protect_level_when_disabled = 1 if config.PROTECT_ACTIVE_HIGH else 0
-protect_level_when_enabled = 0 if config.PROTECT_ACTIVE_HIGH else 1
-tx_level_when_enabled = 1 if config.TX_EN_ACTIVE_HIGH else 0
-tx_level_when_disabled = 0 if config.TX_EN_ACTIVE_HIGH else 1
-
-last_protect_level = None
-last_tx_level = None
-
-while True:
-    now = ticks_ms()
-
-    # --- FAST LOOP ---
-    read_ptt(now_ms=now)
-    keyed = is_keyed()
-
-    if not keyed:
-        band_idx = update_band(now_ms=now)
-
-    state = update_ctrl(latest, now_ms=now, reset_btn_level=read_reset())
-    state["band_idx"] = band_idx
-    state["ptt"] = keyed
-    latest["ptt"] = keyed
-
-    # Drive protection output (disable asserted when state["disable"] is True)
-    protect_level = protect_level_when_disabled if state["disable"] else protect_level_when_enabled
-    if protect_level != last_protect_level:
-        protect_out.value(protect_level)
-        last_protect_level = protect_level
-
-    # TX enable policy: keyed AND amp allowed
-    tx_en = bool(keyed and (not state["disable"]))
-    tx_level = tx_level_when_enabled if tx_en else tx_level_when_disabled
-    if tx_level != last_tx_level:
-        tx_en_out.value(tx_level)
-        last_tx_level = tx_level
-
-    # --- FAST TELEMETRY ---
-    if ticks_diff(now, t_fast) >= fast_telem_ms:
-        t_fast = now
-        latest["vDrain"] = read_vdrain()
-        latest["iDrain"] = read_idrain()
-        latest["vcc"] = read_vcc()
-
-    # --- RF TELEMETRY (non-blocking) ---
-    if ticks_diff(now, t_swr) >= swr_avg_window_ms:
-        t_swr = now
-
-        vfwd = read_ads_voltage(ads_fwd_ch, pga=ads_pga, data_rate=ads_data_rate)
-        vrfl = read_ads_voltage(ads_rfl_ch, pga=ads_pga, data_rate=ads_data_rate)
-
-        # IIR low-pass on detector volts
-        latest["vfwd_v"] = latest["vfwd_v"] + alpha * (vfwd - latest["vfwd_v"])
-        latest["vrfl_v"] = latest["vrfl_v"] + alpha * (vrfl - latest["vrfl_v"])
-
-        # Volts -> Watts using calibration curve
-        pfwd_w = interp_watts(latest["vfwd_v"])
-        prfl_w = interp_watts(latest["vrfl_v"])
-        if pfwd_w < 0.0:
-            pfwd_w = 0.0
-        if prfl_w < 0.0:
-            prfl_w = 0.0
-
-        latest["pfwd_w"] = pfwd_w
-        latest["prfl_w"] = prfl_w
-        latest["swr"] = swr_from_powers(pfwd_w, prfl_w)
-        latest["samples"] = 1
-
-    # --- THERMAL ---
-    if ticks_diff(now, t_therm) >= therm_telem_ms:
-        t_therm = now
-        latest["temp_c"] = read_temp()
-
-    # --- LCD ---
-    if ticks_diff(now, t_lcd) >= lcd_refresh_ms:
-        t_lcd = now
-        update_display(latest, state, now_ms=now)
-
-    # --- PRINT ---
-    if ticks_diff(now, t_print) >= print_period_ms:
-        t_print = now
-        print(
-            "PTT=", keyed,
-            "AMP=", "ON" if state["amp_enabled"] else "OFF",
-            "PROT=", ("TRIP:" + state["reason"]) if state["tripped"] else "OK",
-            "Pfwd=", latest["pfwd_w"], "W",
-            "SWR=", latest["swr"],
-            "Vfwd=", latest["vfwd_v"], "V",
-            "Vrfl=", latest["vrfl_v"], "V",
-            "Vcc=", latest["vcc"],
-            "I=", latest["iDrain"],
-            "Vd=", latest["vDrain"],
-            "T=", latest["temp_c"],
-            "BAND=", band_idx + 1,
-            "FWD_CH=", ads_fwd_ch,
-            "RFL_CH=", ads_rfl_ch
-        )
-
-    sleep_ms(1)
+# --- Main loop ---
+# Everything the loop touches is bound to a local of run() first: locals are
+# slot accesses, while module globals and config.* are dict lookups.
+def run():
+    # --- Scheduling (absolute deadlines; next_due is the earliest of them) ---
+    t0 = utime.ticks_ms()
+    due_fast = utime.ticks_add(t0, config.FAST_TELEM_MS)
+    due_swr = utime.ticks_add(t0, config.SWR_AVG_WINDOW_MS)
+    due_therm = utime.ticks_add(t0, config.THERM_TELEM_MS)
+    due_lcd = utime.ticks_add(t0, dc.LCD_REFRESH_MS)
+    due_print = utime.ticks_add(t0, config.PRINT_PERIOD_MS)
+    next_due = t0
+
+    latest = telemetry.Telemetry()
+
+    state = ctrl.state
+
+    band_idx = config.BAND_DEFAULT_INDEX
+
+    # IIR filter coefficient for RF detector volts (0<alpha<=1). Higher = faster response, noisier.
+    alpha = 0.2
+
+    # --- Hot-path aliases / cached constants ---
+    ticks_ms = utime.ticks_ms
+    ticks_diff = utime.ticks_diff
+    ticks_add = utime.ticks_add
+    sleep_ms = utime.sleep_ms
+
+    protect_out_value = protect_out.value
+    tx_en_value = tx_en_out.value
+    read_ptt = ptt.update
+    is_keyed = ptt.is_keyed
+    read_reset = reset_in.value
+    update_band = bands.update
+    update_ctrl = ctrl.update
+    update_display = disp.update
+
+    read_vdrain = vdrain.read_drain_voltage
+    read_idrain_ma = isense.read_current_ma
+    read_vcc = vcc.read_vcc_voltage
+    temp_from_voltage = temp.temperature_from_voltage
+    ads_start_read = ads.start_read
+    ads_ready = ads.ready
+    ads_last = ads.last
+    interp_watts = swr.v_to_w.interp
+    swr_from_powers = swr_calc.swr_from_powers
+
+    fast_telem_ms = config.FAST_TELEM_MS
+    swr_avg_window_ms = config.SWR_AVG_WINDOW_MS
+    therm_telem_ms = config.THERM_TELEM_MS
+    lcd_refresh_ms = dc.LCD_REFRESH_MS
+    print_period_ms = config.PRINT_PERIOD_MS
+    max_idle_ms = config.LOOP_MAX_IDLE_MS
+    # machine.lightsleep for idle gaps when enabled and the port provides it
+    lightsleep = getattr(machine, "lightsleep", None) if config.LOOP_LIGHTSLEEP else None
+
+    ads_fwd_ch = config.ADS_FWD_CH
+    ads_rfl_ch = config.ADS_RFL_CH
+    therm_ch = config.THERM_ADS_CH
+    therm_pga = config.THERM_ADS_PGA
+    therm_data_rate = config.THERM_ADS_DATA_RATE
+
+    # Which ADS1115 conversion is in flight
+    ADS_IDLE = 0
+    ADS_FWD = 1
+    ADS_RFL = 2
+    ADS_THERM = 3
+    ads_pending = ADS_IDLE
+    vfwd = 0.0
+
+    protect_level_when_disabled = 1 if config.PROTECT_ACTIVE_HIGH else 0
+    protect_level_when_enabled = 0 if config.PROTECT_ACTIVE_HIGH else 1
+    tx_level_when_enabled = 1 if config.TX_EN_ACTIVE_HIGH else 0
+    tx_level_when_disabled = 0 if config.TX_EN_ACTIVE_HIGH else 1
+
+    last_protect_level = None
+    last_tx_level = None
+    last_print_key = None
+
+    while True:
+        now = ticks_ms()
+
+        # --- FAST LOOP ---
+        read_ptt(now_ms=now)
+        keyed = is_keyed()
+
+        if not keyed:
+            band_idx = update_band(now_ms=now)
+
+        state = update_ctrl(latest, now_ms=now, reset_btn_level=read_reset())
+        state.band_idx = band_idx
+        state.ptt = keyed
+        latest.ptt = keyed
+
+        # Drive protection output (disable asserted when state.disable is True)
+        protect_level = protect_level_when_disabled if state.disable else protect_level_when_enabled
+        if protect_level != last_protect_level:
+            protect_out_value(protect_level)
+            last_protect_level = protect_level
+
+        # TX enable policy: keyed AND amp allowed
+        tx_en = bool(keyed and (not state.disable))
+        tx_level = tx_level_when_enabled if tx_en else tx_level_when_disabled
+        if tx_level != last_tx_level:
+            tx_en_value(tx_level)
+            last_tx_level = tx_level
+
+        # --- ADS1115 result (conversion in flight; the timer callback sets ready) ---
+        if ads_pending != ADS_IDLE and ads_ready():
+            v = ads_last()
+
+            if ads_pending == ADS_FWD:
+                vfwd = v
+                ads_start_read(ads_rfl_ch)
+                ads_pending = ADS_RFL
+
+            elif ads_pending == ADS_RFL:
+                ads_pending = ADS_IDLE
+
+                # IIR low-pass on detector volts
+                latest.vfwd_v = latest.vfwd_v + alpha * (vfwd - latest.vfwd_v)
+                latest.vrfl_v = latest.vrfl_v + alpha * (v - latest.vrfl_v)
+
+                # Volts -> Watts using calibration curve
+                pfwd_w = interp_watts(latest.vfwd_v)
+                prfl_w = interp_watts(latest.vrfl_v)
+                if pfwd_w < 0.0:
+                    pfwd_w = 0.0
+                if prfl_w < 0.0:
+                    prfl_w = 0.0
+
+                latest.pfwd_w = pfwd_w
+                latest.prfl_w = prfl_w
+                latest.swr = swr_from_powers(pfwd_w, prfl_w)
+                latest.samples = 1
+
+            else:
+                ads_pending = ADS_IDLE
+                latest.temp_c = temp_from_voltage(v)
+
+        # --- Periodic tasks: one compare per pass until the earliest deadline ---
+        if ticks_diff(now, next_due) < 0:
+            if ads_pending != ADS_IDLE:
+                sleep_ms(1)
+            else:
+                wait = ticks_diff(next_due, now)
+                if wait > max_idle_ms:
+                    wait = max_idle_ms
+                if lightsleep is not None and wait > 1:
+                    lightsleep(wait)
+                else:
+                    sleep_ms(wait)
+            continue
+
+        # --- FAST TELEMETRY ---
+        if ticks_diff(now, due_fast) >= 0:
+            due_fast = ticks_add(now, fast_telem_ms)
+            latest.vDrain = read_vdrain()
+            latest.iDrain_ma = read_idrain_ma()
+            latest.vcc = read_vcc()
+
+        # --- RF / THERMAL TELEMETRY (non-blocking ADS1115 sequence) ---
+        # One conversion in flight at a time: FWD -> RFL per SWR window, and
+        # THERM in the gaps. A deadline that comes due while the ADS is busy
+        # stays overdue and is picked up on the first idle pass.
+        if ads_pending == ADS_IDLE:
+            if ticks_diff(now, due_swr) >= 0:
+                due_swr = ticks_add(now, swr_avg_window_ms)
+                ads_start_read(ads_fwd_ch)
+                ads_pending = ADS_FWD
+            elif ticks_diff(now, due_therm) >= 0:
+                due_therm = ticks_add(now, therm_telem_ms)
+                ads_start_read(therm_ch, therm_pga, therm_data_rate)
+                ads_pending = ADS_THERM
+
+        # --- LCD ---
+        if ticks_diff(now, due_lcd) >= 0:
+            due_lcd = ticks_add(now, lcd_refresh_ms)
+            update_display(latest, state, now_ms=now)
+
+        # --- PRINT (only when the summary changed since the last line) ---
+        if ticks_diff(now, due_print) >= 0:
+            due_print = ticks_add(now, print_period_ms)
+            # Every printed field, at roughly its useful resolution
+            print_key = (
+                keyed, state.disable, state.amp_enabled, state.tripped, state.reason,
+                round(latest.pfwd_w, 1), round(latest.swr, 2), latest.iDrain_ma // 10, band_idx,
+                round(latest.vfwd_v, 3), round(latest.vrfl_v, 3), round(latest.vcc, 1),
+                round(latest.vDrain, 1), round(latest.temp_c, 1)
+            )
+            if print_key != last_print_key:
+                last_print_key = print_key
+                print(
+                    "PTT=", keyed,
+                    "AMP=", "ON" if state.amp_enabled else "OFF",
+                    "PROT=", ("TRIP:" + state.reason) if state.tripped else "OK",
+                    "Pfwd=", latest.pfwd_w, "W",
+                    "SWR=", latest.swr,
+                    "Vfwd=", latest.vfwd_v, "V",
+                    "Vrfl=", latest.vrfl_v, "V",
+                    "Vcc=", latest.vcc,
+                    "I=", latest.iDrain_ma * 0.001,
+                    "Vd=", latest.vDrain,
+                    "T=", latest.temp_c,
+                    "BAND=", band_idx + 1,
+                    "FWD_CH=", ads_fwd_ch,
+                    "RFL_CH=", ads_rfl_ch
+                )
+
+        # Earliest remaining deadline, measured relative to now so tick wrap is safe
+        wait = ticks_diff(due_fast, now)
+        d = ticks_diff(due_swr, now)
+        if d < wait:
+            wait = d
+        d = ticks_diff(due_therm, now)
+        if d < wait:
+            wait = d
+        d = ticks_diff(due_lcd, now)
+        if d < wait:
+            wait = d
+        d = ticks_diff(due_print, now)
+        if d < wait:
+            wait = d
+        next_due = ticks_add(now, wait)
+
+        sleep_ms(1)
+
+
+run()
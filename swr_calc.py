@@ -1,7 +1,8 @@
 # swr_calc.py
 import math
+import table_cache
 from interp import PiecewiseLinear
-from a2d import _DR_SPS
+from a2d import _sps
 
 def _try_float(s):
     try:
@@ -11,6 +12,11 @@ def _try_float(s):
 
 def load_v_to_w_curve(csv_path):
     # CSV is Power_W, Voltage_V (header likely "FWD,V")
+    cached = table_cache.load(csv_path)
+    if cached is not None:
+        power_w, volts_v = cached
+        return PiecewiseLinear(volts_v, power_w)
+
     power_w = []
     volts_v = []
     with open(csv_path, "r") as f:
@@ -30,23 +36,24 @@ def load_v_to_w_curve(csv_path):
 
     if len(power_w) < 2:
         raise ValueError("Calibration table has insufficient numeric rows")
+    table_cache.save(csv_path, power_w, volts_v)
 
     # invert: V -> W
     return PiecewiseLinear(volts_v, power_w)
 
+_INF = float("inf")
+_sqrt = math.sqrt
+# Reflected/forward power ratio at which SWR (~199:1) is reported as infinite
+_RATIO_INF = 0.98
+
 def swr_from_powers(pfwd_w, prfl_w):
     if pfwd_w <= 0.0:
-        return float("inf")
-    if prfl_w < 0.0:
-        prfl_w = 0.0
-    ratio = prfl_w / pfwd_w
-    if ratio >= 1.0:
-        return float("inf")
-    gamma = math.sqrt(ratio)
-    denom = 1.0 - gamma
-    if denom <= 0.0:
-        return float("inf")
-    return (1.0 + gamma) / denom
+        return _INF
+    ratio = prfl_w / pfwd_w if prfl_w > 0.0 else 0.0
+    if ratio >= _RATIO_INF:
+        return _INF
+    gamma = _sqrt(ratio)
+    return (1.0 + gamma) / (1.0 - gamma)
 
 class SWRCalc:
     def __init__(self, ads1115, fwd_channel, rfl_channel, pga, data_rate, table_path):
@@ -59,18 +66,14 @@ class SWRCalc:
 
     def read_avg_volts(self, window_ms=100):
         # Deterministic sample count derived from ADS1115 SPS
-        sps = _DR_SPS.get(self.data_rate, 128)
+        sps = _sps(self.data_rate)
         samples = int((sps * window_ms) / 1000)
         if samples < 1:
             samples = 1
 
-        sum_fwd = 0.0
-        sum_rfl = 0.0
-        for _ in range(samples):
-            sum_fwd += self.ads.read_voltage(self.fwd_ch, pga=self.pga, data_rate=self.data_rate)
-            sum_rfl += self.ads.read_voltage(self.rfl_ch, pga=self.pga, data_rate=self.data_rate)
-
-        return (sum_fwd / samples), (sum_rfl / samples), samples
+        vfwd_v, vrfl_v = self.ads.read_avg_pair(
+            self.fwd_ch, self.rfl_ch, self.pga, self.data_rate, samples)
+        return vfwd_v, vrfl_v, samples
 
     def compute(self, window_ms=100):
         vfwd_v, vrfl_v, n = self.read_avg_volts(window_ms=window_ms)
@@ -0,0 +1,65 @@
+# table_cache.py
+# Binary sidecar cache for the two-column calibration CSVs.
+#
+# The first boot after a CSV changes parses it as usual and writes
+# <csv_path>.bin next to it (all little-endian):
+#   uint32 csv size, uint32 csv mtime, uint32 n,
+#   n float32 x values, n float32 y values
+# Later boots read the two arrays straight from the sidecar as long as the
+# CSV's size and mtime still match the header exactly. The Pico RTC restarts
+# at a fixed date on every standalone boot, so "sidecar newer than CSV"
+# cannot be trusted either way.
+
+import os
+import struct
+from array import array
+
+_HDR = "<III"
+_HDR_LEN = 12
+
+
+def _csv_stamp(csv_path):
+    # (size, mtime) of the CSV, or None if it cannot be stat'ed
+    try:
+        st = os.stat(csv_path)
+    except OSError:
+        return None
+    return st[6] & 0xFFFFFFFF, st[8] & 0xFFFFFFFF
+
+
+def load(csv_path):
+    """Return (xs, ys) as array('f') from a sidecar matching the CSV, or None."""
+    stamp = _csv_stamp(csv_path)
+    if stamp is None:
+        return None
+    bin_path = csv_path + ".bin"
+    try:
+        bin_size = os.stat(bin_path)[6]
+        with open(bin_path, "rb") as f:
+            size, mtime, n = struct.unpack(_HDR, f.read(_HDR_LEN))
+            if (size, mtime) != stamp:
+                return None
+            # Sanity-check n against the file length before allocating
+            if n < 2 or bin_size != _HDR_LEN + 8 * n:
+                return None
+            xs = array("f", bytes(4 * n))
+            ys = array("f", bytes(4 * n))
+            if f.readinto(xs) != 4 * n or f.readinto(ys) != 4 * n:
+                return None
+    except (OSError, ValueError, MemoryError):
+        return None
+    return xs, ys
+
+
+def save(csv_path, xs, ys):
+    # Best effort: a read-only or full filesystem just means no cache
+    stamp = _csv_stamp(csv_path)
+    if stamp is None:
+        return
+    try:
+        with open(csv_path + ".bin", "wb") as f:
+            f.write(struct.pack(_HDR, stamp[0], stamp[1], len(xs)))
+            f.write(array("f", xs))
+            f.write(array("f", ys))
+    except OSError:
+        pass
@@ -0,0 +1,29 @@
+# telemetry.py
+# Single, reused telemetry record shared by main loop, protection and display.
+#
+# main.py creates one instance at boot and updates its fields in place every
+# tick, so the hot loop never builds a fresh dict. Consumers read attributes
+# directly (no .get() defaults); every field is populated at construction.
+
+
+class Telemetry:
+    __slots__ = (
+        "pfwd_w", "prfl_w", "swr", "samples",
+        "vDrain", "iDrain_ma", "vcc", "temp_c", "ptt",
+        "vfwd_v", "vrfl_v",
+    )
+
+    def __init__(self):
+        self.pfwd_w = 0.0
+        self.prfl_w = 0.0
+        self.swr = float("inf")
+        self.samples = 0
+        self.vDrain = 0.0
+        self.iDrain_ma = 0
+        self.vcc = 0.0
+        self.temp_c = 0.0
+        self.ptt = False
+
+        # RF detector volts after the IIR filter (state kept across ticks)
+        self.vfwd_v = 0.0
+        self.vrfl_v = 0.0
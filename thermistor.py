@@ -16,6 +16,7 @@
 #   3) build interpolator Vadc -> Temp_F
 #   4) convert to Celsius for protection
 
+import table_cache
 from interp import PiecewiseLinear
 
 
@@ -37,7 +38,12 @@ def load_two_row_table(csv_path):
       Resistance,<ohms values...>
 
     Returns: (temps_f_list, resistances_ohms_list)
+    (array('f') pair when served from the binary sidecar cache)
     """
+    cached = table_cache.load(csv_path)
+    if cached is not None:
+        return cached
+
     with open(csv_path, "r") as f:
         lines = [ln.strip() for ln in f if ln.strip()]
 
@@ -56,6 +62,7 @@ def load_two_row_table(csv_path):
     if len(temps_f) != len(res_ohm):
         raise ValueError("Thermistor CSV temperature and resistance lists are different lengths")
 
+    table_cache.save(csv_path, temps_f, res_ohm)
     return temps_f, res_ohm
 
 
@@ -74,6 +81,8 @@ class ThermistorADS:
         self.r_fixed = float(r_fixed)
         self.pga = pga if pga is not None else PGA_4_096V
         self.data_rate = data_rate if data_rate is not None else DR_250SPS
+        # Same PGA / data rate as the ADS constructor: use its precomputed fast path
+        self._fast = self.pga == ads1115.pga and self.data_rate == ads1115.data_rate
 
         # Load measured table (Temp_F, R)
         temps_f, res_ohm = load_two_row_table(csv_path)
@@ -89,12 +98,18 @@ class ThermistorADS:
         return (tf - 32.0) * (5.0 / 9.0)
 
     def read_adc_voltage(self):
-        return self.ads.read_voltage(channel=self.ch, pga=self.pga, data_rate=self.data_rate)
+        if self._fast:
+            return self.ads.read_voltage(self.ch)
+        return self.ads.read_voltage_cfg(self.ch, self.pga, self.data_rate)
 
     def read_temperature_f(self):
         v = self.read_adc_voltage()
         return self.v_to_tf.interp(v)
 
+    def temperature_from_voltage(self, v):
+        # Celsius from an ADC voltage sampled elsewhere (e.g. non-blocking ADS read)
+        return self.f_to_c(self.v_to_tf.interp(v))
+
     def read_temperature_c(self):
         return self.f_to_c(self.read_temperature_f())
 